@@ -161,12 +161,30 @@ def portfolio_status(portfolio_name):
     return jsonify(status)
 
 
+@app.route('/api/portfolios/summary', methods=['GET'])
+def portfolios_summary():
+    summary = portfolio.get_portfolios_summary()
+    return jsonify(summary)
+
+
 @app.route('/api/portfolio/<string:portfolio_name>/performance', methods=['GET'])
 def portfolio_performance(portfolio_name):
     perf = portfolio.get_performance(portfolio_name)
     return jsonify(perf)
 
 
+@app.cli.command('compact-cache')
+def compact_cache():
+    """Recompress cached ticker data and vacuum the database."""
+    stats = database.compact_ticker_cache()
+    print(
+        f"Rewrote {stats['rewritten']} of {stats['tickers']} cached tickers. "
+        f"Data: {stats['data_bytes_before']} -> {stats['data_bytes_after']} bytes. "
+        f"File: {stats['file_bytes_before']} -> {stats['file_bytes_after']} bytes "
+        f"({stats['bytes_saved']} bytes saved)."
+    )
+
+
 if __name__ == '__main__':
     # Run the Flask app
     # In a production environment, you would use a proper WSGI server like Gunicorn
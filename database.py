@@ -1,9 +1,17 @@
 import sqlite3
 import json
+import os
+import zlib
 from datetime import datetime
 
 DATABASE_NAME = 'ticker_data.db'
 
+# Cached ticker payloads are stored as a versioned, zlib-compressed blob.
+# Rows written before the codec existed hold plain JSON text and are still
+# readable; they are rewritten in the current format on their next save.
+STORAGE_MAGIC = b'FDS'
+STORAGE_VERSION = 1
+
 
 def init_db():
     """Initializes the database and creates the 'tickers' table if it doesn't exist."""
@@ -43,6 +51,81 @@ def init_db():
     print("Database initialized.")
 
 
+def _records_to_columns(records):
+    """Convert a list of uniform dicts into a ``{"columns", "values"}`` dict.
+
+    Returns ``None`` when the rows do not all share the same keys, in which
+    case the list is stored as-is.
+    """
+    if not records or not all(isinstance(r, dict) for r in records):
+        return None
+    columns = list(records[0].keys())
+    if not columns or any(list(r.keys()) != columns for r in records):
+        return None
+    return {
+        "columns": columns,
+        "values": [[r[c] for r in records] for c in columns],
+    }
+
+
+def _columns_to_records(table):
+    """Inverse of :func:`_records_to_columns`."""
+    columns = table["columns"]
+    return [dict(zip(columns, row)) for row in zip(*table["values"])]
+
+
+def encode_ticker_data(data):
+    """Serialize a ticker payload into the compact storage format.
+
+    History and event rows are stored column-wise so each key name appears
+    once, then the whole record is JSON encoded and zlib compressed.
+    """
+    payload = dict(data)
+    columnar = []
+    if isinstance(payload.get("history"), list):
+        table = _records_to_columns(payload["history"])
+        if table is not None:
+            payload["history"] = table
+            columnar.append("history")
+    events = payload.get("events")
+    if isinstance(events, dict):
+        events = dict(events)
+        for key, value in events.items():
+            if isinstance(value, list):
+                table = _records_to_columns(value)
+                if table is not None:
+                    events[key] = table
+                    columnar.append("events." + key)
+        payload["events"] = events
+    record = {"payload": payload, "columnar": columnar}
+    body = zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"), 9)
+    return STORAGE_MAGIC + bytes([STORAGE_VERSION]) + body
+
+
+def decode_ticker_data(raw):
+    """Deserialize a stored ticker payload.
+
+    Accepts both the compact format and legacy plain JSON text.
+    """
+    if isinstance(raw, str):
+        return json.loads(raw)
+    raw = bytes(raw)
+    if not raw.startswith(STORAGE_MAGIC):
+        return json.loads(raw.decode("utf-8"))
+    version = raw[len(STORAGE_MAGIC)]
+    if version != STORAGE_VERSION:
+        raise ValueError(f"Unsupported ticker storage version: {version}")
+    record = json.loads(zlib.decompress(raw[len(STORAGE_MAGIC) + 1:]).decode("utf-8"))
+    payload = record["payload"]
+    for name in record.get("columnar", []):
+        if name == "history":
+            payload["history"] = _columns_to_records(payload["history"])
+        elif name.startswith("events."):
+            key = name[len("events."):]
+            payload["events"][key] = _columns_to_records(payload["events"][key])
+    return payload
+
+
 def get_ticker_data(ticker_symbol):
     """
     Retrieves data for a specific ticker from the database.
@@ -58,8 +141,8 @@ def get_ticker_data(ticker_symbol):
     conn.close()
 
     if row:
-        # The data is stored as a JSON string, so we parse it back into a Python dict
-        data = json.loads(row['data'])
+        # The data is either a compressed blob or legacy JSON text
+        data = decode_ticker_data(row['data'])
         # The timestamp is stored as a string, so we parse it back into a datetime object
         last_updated = datetime.fromisoformat(row['last_updated'])
         return data, last_updated
@@ -75,19 +158,62 @@ def save_ticker_data(ticker_symbol, data):
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
 
-    # Serialize the data dictionary into a JSON string for storage
-    data_json = json.dumps(data)
+    # Serialize the data dictionary into the compact storage format
+    data_blob = sqlite3.Binary(encode_ticker_data(data))
     current_time = datetime.now().isoformat()
 
     cursor.execute('''
         INSERT OR REPLACE INTO tickers (ticker, data, last_updated)
         VALUES (?, ?, ?)
-    ''', (ticker_symbol, data_json, current_time))
+    ''', (ticker_symbol, data_blob, current_time))
 
     conn.commit()
     conn.close()
 
 
+def compact_ticker_cache():
+    """
+    Rewrite every cached ticker in the current storage format and vacuum
+    the database file. Returns a dict describing the space reclaimed.
+    """
+    size_before = os.path.getsize(DATABASE_NAME)
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT ticker, data FROM tickers")
+    rows = cursor.fetchall()
+    data_before = 0
+    data_after = 0
+    rewritten = 0
+    for ticker_symbol, raw in rows:
+        stored = raw.encode("utf-8") if isinstance(raw, str) else bytes(raw)
+        encoded = encode_ticker_data(decode_ticker_data(raw))
+        data_before += len(stored)
+        data_after += len(encoded)
+        if encoded != stored:
+            # last_updated is left untouched so cache freshness is unchanged
+            cursor.execute(
+                "UPDATE tickers SET data = ? WHERE ticker = ?",
+                (sqlite3.Binary(encoded), ticker_symbol),
+            )
+            rewritten += 1
+    conn.commit()
+
+    cursor.execute("VACUUM")
+    conn.close()
+    size_after = os.path.getsize(DATABASE_NAME)
+
+    return {
+        "tickers": len(rows),
+        "rewritten": rewritten,
+        "data_bytes_before": data_before,
+        "data_bytes_after": data_after,
+        "file_bytes_before": size_before,
+        "file_bytes_after": size_after,
+        "bytes_saved": size_before - size_after,
+    }
+
+
 def create_portfolio(name):
     """Create a portfolio if it doesn't already exist."""
     conn = sqlite3.connect(DATABASE_NAME)
@@ -137,6 +263,33 @@ def get_transactions(portfolio):
     return [dict(row) for row in rows]
 
 
+def get_all_positions():
+    """
+    Return a dict of portfolio -> {ticker: total quantity} for every portfolio,
+    computed in a single grouped query. Portfolios without transactions map
+    to an empty dict.
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT p.name, t.ticker, SUM(t.quantity)
+        FROM portfolios p
+        LEFT JOIN transactions t ON t.portfolio = p.name
+        GROUP BY p.name, t.ticker
+        ORDER BY p.name, t.ticker
+        """
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    positions = {}
+    for portfolio, ticker, qty in rows:
+        holdings = positions.setdefault(portfolio, {})
+        if ticker is not None:
+            holdings[ticker] = float(qty)
+    return positions
+
+
 def aggregate_positions(transactions):
     """Return a dict of ticker -> total quantity."""
     positions = {}
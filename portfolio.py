@@ -5,18 +5,21 @@ import database
 import data_fetcher
 
 
-def get_portfolio_status(portfolio_name):
-    """Return current holdings with latest prices."""
-    txs = database.get_transactions(portfolio_name)
-    positions = database.aggregate_positions(txs)
+def _latest_price(ticker):
+    """Return the latest market price for a ticker, or 0 if unavailable."""
+    data, _ = data_fetcher.fetch_with_cache(ticker)
+    info = data.get("info", {}) if data else {}
+    return info.get("regularMarketPrice", 0)
+
+
+def _build_status(positions, prices):
+    """Build a status dict from ticker -> quantity and ticker -> price."""
     holdings = []
     total_value = 0.0
     for ticker, qty in positions.items():
         if qty == 0:
             continue
-        data, _ = data_fetcher.fetch_with_cache(ticker)
-        info = data.get("info", {}) if data else {}
-        price = info.get("regularMarketPrice", 0)
+        price = prices[ticker]
         value = price * qty
         total_value += value
         holdings.append({
@@ -28,6 +31,36 @@ def get_portfolio_status(portfolio_name):
     return {"holdings": holdings, "total_value": total_value}
 
 
+def get_portfolio_status(portfolio_name):
+    """Return current holdings with latest prices."""
+    txs = database.get_transactions(portfolio_name)
+    positions = database.aggregate_positions(txs)
+    prices = {ticker: _latest_price(ticker) for ticker, qty in positions.items() if qty != 0}
+    return _build_status(positions, prices)
+
+
+def get_portfolios_summary():
+    """
+    Return holdings and totals for every portfolio plus a grand total.
+    Each distinct ticker is priced once, however many portfolios hold it.
+    """
+    all_positions = database.get_all_positions()
+    tickers = {
+        ticker
+        for positions in all_positions.values()
+        for ticker, qty in positions.items()
+        if qty != 0
+    }
+    prices = {ticker: _latest_price(ticker) for ticker in sorted(tickers)}
+    portfolios = {}
+    total_value = 0.0
+    for name, positions in all_positions.items():
+        status = _build_status(positions, prices)
+        portfolios[name] = status
+        total_value += status["total_value"]
+    return {"portfolios": portfolios, "total_value": total_value}
+
+
 def get_performance(portfolio_name):
     """Compute simple performance trend using daily closes."""
     txs = database.get_transactions(portfolio_name)
@@ -2,6 +2,8 @@ import unittest
 from unittest import mock
 import tempfile
 import os
+import json
+import sqlite3
 import types
 import sys
 import pandas as pd
@@ -29,6 +31,38 @@ class DatabaseTestCase(unittest.TestCase):
         self.assertEqual(data, sample)
         self.assertIsNotNone(ts)
 
+    def test_ticker_data_storage_codec(self):
+        sample = {
+            'info': {'shortName': 'Test'},
+            'history': [
+                {'Date': '2020-01-01', 'Close': 1.0},
+                {'Date': '2020-01-02', 'Close': 2.0},
+            ],
+            'events': {'actions': [], 'dividends': [{'Date': '2020-01-01', 'Dividends': 0.1}]},
+        }
+        encoded = database.encode_ticker_data(sample)
+        self.assertTrue(encoded.startswith(database.STORAGE_MAGIC))
+        self.assertEqual(database.decode_ticker_data(encoded), sample)
+
+    def test_legacy_json_rows_and_compaction(self):
+        sample = {'info': {}, 'history': [{'Date': '2020-01-01', 'Close': 1.0}] * 50}
+        conn = sqlite3.connect(database.DATABASE_NAME)
+        conn.execute(
+            "INSERT INTO tickers (ticker, data, last_updated) VALUES (?, ?, ?)",
+            ('OLD', json.dumps(sample), '2020-01-01T00:00:00'),
+        )
+        conn.commit()
+        conn.close()
+        data, _ = database.get_ticker_data('OLD')
+        self.assertEqual(data, sample)
+
+        stats = database.compact_ticker_cache()
+        self.assertEqual(stats['rewritten'], 1)
+        self.assertLess(stats['data_bytes_after'], stats['data_bytes_before'])
+        data, ts = database.get_ticker_data('OLD')
+        self.assertEqual(data, sample)
+        self.assertEqual(ts.isoformat(), '2020-01-01T00:00:00')
+
     def test_transactions_and_aggregate(self):
         database.create_portfolio('p1')
         txs = [{
@@ -126,6 +160,19 @@ class PortfolioTestCase(unittest.TestCase):
             perf = portfolio.get_performance('p1')
             self.assertTrue(len(perf) > 0)
 
+    def test_portfolios_summary(self):
+        database.create_portfolio('p2')
+        database.save_transactions('p2', [
+            {'ticker': 'AAA', 'quantity': 3, 'price': 10, 'date': '2020-01-01', 'label': ''},
+        ])
+        fake_fetch = mock.Mock(return_value=({'info': {'regularMarketPrice': 5}}, 'CACHE'))
+        with mock.patch('data_fetcher.fetch_with_cache', fake_fetch):
+            summary = portfolio.get_portfolios_summary()
+        self.assertEqual(fake_fetch.call_count, 2)
+        self.assertEqual(summary['portfolios']['p1']['total_value'], 15)
+        self.assertEqual(summary['portfolios']['p2']['total_value'], 15)
+        self.assertEqual(summary['total_value'], 30)
+
 
 class ApiTestCase(unittest.TestCase):
     def setUp(self):